@@ -5,4 +5,5 @@
 Modules exported by this package:
 
 - `minihelio`: Basic functions and methods for solar engineering with Python
+- `horizon`: Horizon profile of obstacles for shading calculations
 """
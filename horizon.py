@@ -0,0 +1,102 @@
+# horizon.py
+
+"""Horizon profile of obstacles for shading calculations
+
+The obstacles are clouds of 3D points (see point3d); the profile holds
+the maximum obstacle elevation (altitude) seen from the observer in each
+azimuth bin, so the shading of the sun is one lookup per sun position.
+
+Azimuths are measured as in `khelio.azi` (from the North, clockwise,
+degrees(arctan2(-x, -y)) in the frame of Point3D: x - west, y - south,
+z - up); unlike `point3d.Point3D.azimuth`, there is no special case for
+y == 0. Altitudes in degrees.
+
+Classes:
+--------
+`HorizonProfile(points, observer, resolution)`: maximum obstacle
+              elevation per azimuth bin, incrementally updatable.
+
+------------------------------------------------------------------------
+
+"""
+
+import numpy as np
+
+from point3d import Point3D, Point3DArray
+
+
+class HorizonProfile:
+    """Horizon profile: the maximum elevation of the obstacle points in
+    each azimuth bin of `resolution` degrees, -90 for the empty bins.
+
+    Example:
+        hp = HorizonProfile(building, observer=P0, resolution=0.5)
+        hp.add(tree)
+        shaded = hp.blocked(kh.azi(DEC, LAT, HRA), kh.alt(DEC, LAT, HRA))
+    """
+
+    def __init__(self, points=None, observer=(0, 0, 0), resolution=1.0):
+        """
+        Args:
+            points - obstacle points: Point3DArray, list of Point3D
+                     or (N, 3) array, optional.
+            observer - the observer point: Point3D or (x, y, z).
+            resolution (float) - width of the azimuth bins (degrees),
+                                 a divisor of 360.
+        """
+        nrBins = 360/resolution
+        if round(nrBins) != nrBins or nrBins < 1:
+            raise ValueError(f"Resolution of {resolution} deg, expected "
+                             "a divisor of 360.")
+        if isinstance(observer, Point3D):
+            observer = observer.coords
+        self.observer = np.array(observer, dtype=float)
+        self.resolution = resolution
+        self.profile = np.full(int(round(nrBins)), -90.0)
+        if points is not None:
+            self.add(points)
+
+    def add(self, points):
+        """Adds obstacle points to the profile (the points at the
+        observer itself are skipped)."""
+
+        rel = _points(points) - self.observer
+        rel = rel[np.any(rel.coords != 0, axis=1)]
+        AZI = np.degrees(np.arctan2(-rel.x, -rel.y)) % 360
+        np.maximum.at(self.profile, self._bins(AZI), rel.altitude)
+        return self
+
+    def elevation(self, AZI):
+        """Maximum obstacle elevation for the azimuths AZI."""
+
+        return self.profile[self._bins(AZI)]
+
+    def blocked(self, AZI, ALT):
+        """Is the sun at (AZI, ALT) blocked by the obstacles?
+        (arrays, broadcast against each other)"""
+
+        return np.asarray(ALT) < self.elevation(AZI)
+
+    def _bins(self, AZI):
+        """'Internal' method, azimuth bin indices."""
+
+        bins = np.floor_divide(AZI, self.resolution).astype(int)
+        return bins % len(self.profile)
+
+    def __repr__(self):
+
+        return (f"HorizonProfile of {len(self.profile)} bins, "
+                f"observer at {tuple(self.observer.tolist())}")
+
+
+def _points(points):
+    """'Internal' method, obstacle points as a Point3DArray."""
+
+    if isinstance(points, Point3DArray):
+        return points
+    if isinstance(points, Point3D):
+        points = [points]
+    points = list(points) if not isinstance(points, np.ndarray) else points
+    if len(points) and isinstance(points[0], Point3D):
+        return Point3DArray([P.coords for P in points])
+    return Point3DArray(points)
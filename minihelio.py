@@ -8,13 +8,15 @@ Variables:
 ----------
 `mtDays`: dictionary with the sum of days
         in the previous month(s) (if any)
+`mtDaysAr`: `mtDays` as an array, for common and leap years
+`decs`: solar declinations for the day numbers 0..366
 
 Functions:
 ----------
-`dayNr(*args)`: calculates the number of a day in the year,
-              for different arguments
+`dayNr(*args, year=None)`: calculates the number of a day in the year,
+              for different arguments (also arrays of dates)
               
-`dec(dn)`: calculates solar declination for the given day.
+`dec(dn)`: calculates solar declination for the given day(s).
 
 ------------------------------------------------------------------------
 
@@ -33,6 +35,12 @@ mtDays = {1: 0, 2: 31, 3: 59,
              up to certain month (included)"""
 
 
+mtDaysAr = np.array([[0] + [mtDays[m] for m in range(1, 13)],
+                     [0] + [mtDays[m] + (m > 2) for m in range(1, 13)]])
+"""mtDaysAr: `mtDays` as an array indexed by [leap, month],
+             for common (0) and leap (1) years"""
+
+
 def _oneDayNr(m, d):
     """'Internal' method, returns number of the day in a year
     for a single day and common year.
@@ -41,9 +49,27 @@ def _oneDayNr(m, d):
     return d + mtDays[m]
 
 
-def dayNr(*args):
+def _dayNrAr(mm, dd, year=None):
+    """'Internal' method, returns numbers of the days in a year
+    for arrays of months and days, with domain check.
+    """
+
+    mm = np.asarray(mm, dtype=int)
+    dd = np.asarray(dd, dtype=int)
+    if np.any((mm < 1) | (mm > 12) | (dd < 1) | (dd > 31)):
+        raise ValueError("Invalid date")
+    if year is None:
+        leap = 0
+    else:
+        year = np.asarray(year)
+        leap = ((year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+                ).astype(int)
+    return mtDaysAr[leap, mm] + dd
+
+
+def dayNr(*args, year=None):
     """Number of the day in a year dayNr = f(mm, dd): month, day
-    or f((mm, dd)).
+    or f((mm, dd)), or f(dates) for arrays of dates.
 
     Examples:
         >>> from datetime import datetime
@@ -51,14 +77,22 @@ def dayNr(*args):
         True
         >>> dayNr(6, 22) == datetime(2022, 6, 22).timetuple().tm_yday
         True
+        >>> dayNr([(2, 28), (3, 1)], year=2024).tolist()
+        [59, 61]
+        >>> dayNr(np.array(['2024-03-01', '2023-03-01'],
+        ...                dtype='datetime64[D]')).tolist()
+        [61, 60]
 
     Args:
         m (int): A number of the month.
         d (int): A number of the day.
         or (m, d): a tuple of the numbers.
+        or dates: (N, 2) array (or list, tuple) of (m, d), structured array
+            with fields ('m', 'd') or ('month', 'day'), or datetime64 array.
+        year (int or array_like): Year(s), for leap years, optional.
 
     Returns:
-        int: A number of the day in year.
+        int: A number of the day in year (ndarray for arrays of dates).
 
     Raises:
         ValueError: An error for invalid date.
@@ -69,25 +103,35 @@ def dayNr(*args):
     if (len(args) == 2):
         mm = args[0]
         dd = args[1]
-    elif len(args) == 1 and isinstance(args[0], tuple):
+    elif (len(args) == 1 and isinstance(args[0], tuple) and len(args[0]) == 2
+          and np.ndim(args[0][0]) == 0 and np.ndim(args[0][1]) == 0):
         mm = args[0][0]
         dd = args[0][1]
-    elif isinstance(args[0], np.ndarray) or isinstance(args[0], list):
-        results = np.array([], dtype=int)
-        for tp in args[0]:
-            results = np.append(results, _oneDayNr(tp[0], tp[1]))
-        return results
+    elif isinstance(args[0], (np.ndarray, list, tuple)):
+        dates = np.asarray(args[0])
+        if dates.dtype.kind == 'M':
+            days = dates.astype('M8[D]')
+            return (days - days.astype('M8[Y]')).astype(int) + 1
+        if dates.dtype.names is not None:
+            names = ('m', 'd') if 'm' in dates.dtype.names else ('month', 'day')
+            return _dayNrAr(dates[names[0]], dates[names[1]], year)
+        return _dayNrAr(dates[..., 0], dates[..., 1], year)
     else:
         raise TypeError("Wrong date format (should be (m, d)).")
+    if np.ndim(mm) > 0 or np.ndim(dd) > 0:
+        return _dayNrAr(mm, dd, year)
     if mm > 12 or dd > 31:
         raise ValueError("Invalid date")
+    if year is not None:
+        return int(_dayNrAr(mm, dd, year))
     return _oneDayNr(mm, dd)
 
 
 def dec(dn):
     """Solar declination DEC = dec(dn), with domain check.
     
-    The input argument, `dn` cannot exceed 366.
+    The input argument, `dn` cannot exceed 366. Integer day numbers
+    (also arrays) within 0..366 are gathered from `decs`.
     
     Examples:
         >>> import khelio as kh
@@ -107,11 +151,24 @@ def dec(dn):
         ValueError: For day number greater than 366.
     """
 
-    if dn > 366:
+    dn = np.asarray(dn)
+    if np.any(dn > 366):
         raise ValueError("Day number > 366.")
+    if dn.dtype.kind in 'iu' and np.all(dn >= 0):
+        return decs[dn]
+    return _dec(dn)
+
+
+def _dec(dn):
+    """'Internal' method, solar declination without domain check."""
+
     return 23.45 * np.sin( (360.0 * (np.array(dn) + 284.0)/365.0)*d2r )
 
 
+decs = _dec(np.arange(367))
+"""decs: solar declinations for the day numbers 0..366"""
+
+
 def testDayNr():
     dates = [(3, 21), (6, 22)]
     for i, date in enumerate(dates):
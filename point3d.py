@@ -9,7 +9,6 @@ import numbers
 import numpy as np
 from numpy.linalg import norm as norm
 import scipy as sp
-import Vector3D as v3d
 
 filename = 'Point3D.py'
 
@@ -24,56 +23,86 @@ class Point3D:
     credit -- http://codereview.stackexchange.com/questions/12261/what-could-be-improved-in-this-implementation-of-a-vector3d-class
     """
 
+    __slots__ = ('_coords', '_name', '_clr', 'distant', 'size')
+
     def __init__(self, x = 0.0, y = 0.0, z = 0.0, name = '',
                  distant = False, size = 20,
                  color = (0, 0, 0)):
         for arg in (x, y, z):
             if not isinstance(arg, numbers.Number):
                 raise TypeError
-        self.coords = (x, y, z)
-        self.coordsAr = [x, y, z]
+        self._coords = (x, y, z)
         self.distant = distant
         self.size = size
-        self.__name__ = name
-        self.__clr__ = color
+        self._name = name
+        self._clr = color
+
+    @classmethod
+    def _new(cls, x, y, z, name='', distant=False, size=20,
+             color=(0, 0, 0)):
+        """'Internal' method, a new point without the argument checks,
+        for the results of the point operations"""
+
+        P = object.__new__(cls)
+        P._coords = (x, y, z)
+        P.distant = distant
+        P.size = size
+        P._name = name
+        P._clr = color
+        return P
+
+    @property
+    def coords(self):
+        return self._coords
+    @coords.setter
+    def coords(self, coords):
+        self._coords = tuple(coords)
+
+    @property
+    def coordsAr(self):
+        return list(self._coords)
+    @coordsAr.setter
+    def coordsAr(self, coords):
+        self._coords = tuple(coords)
 
     @property
     def x(self):
-        return self.coords[0]
+        return self._coords[0]
     @x.setter
     def x(self, number):
-        self.coords = (number, self.coords[1], self.coords[2])
-        self.coordsAr = [number, self.coords[1], self.coords[2]]
+        self._coords = (number, self._coords[1], self._coords[2])
 
     @property
     def y(self):
-        return self.coords[1]
+        return self._coords[1]
     @y.setter
     def y(self, number):
-        self.coords = (self.coords[0], number, self.coords[2])
-        self.coordsAr = [self.coords[0], number, self.coords[2]]
+        self._coords = (self._coords[0], number, self._coords[2])
 
     @property
     def z(self):
-        return self.coords[2]
+        return self._coords[2]
     @z.setter
     def z(self, number):
-        self.coords = (self.coords[0], self.coords[1], number)
-        self.coordsAr = [self.coords[0], self.coords[1], number]
+        self._coords = (self._coords[0], self._coords[1], number)
 
     @property
     def name(self):
-        return self.__name__
+        return self._name
     @name.setter
     def name(self, text):
-        self.__name__ = text
+        self._name = text
+
+    __name__ = name
 
     @property
     def color(self):
-        return self.__clr__
+        return self._clr
     @color.setter
     def color(self, color=(0, 0, 0)):
-        self.__clr__ = color
+        self._clr = color
+
+    __clr__ = color
 
     @property
     def azimuth(self):
@@ -115,7 +144,7 @@ class Point3D:
         x = self.coords[0]
         y = self.coords[1]
         name = self.name + '_0'
-        return Point3D(x, y, 0, name)
+        return Point3D._new(x, y, 0, name)
 
     def distance(self, other):
         """Distance between two points"""
@@ -150,7 +179,8 @@ class Point3D:
         distant=False
         if 'distant' in kwargs:
             distant = kwargs['distant']
-        return Point3D(newX, newY, newZ, name=newName, distant=distant)
+        return Point3D._new(newX, newY, newZ, name=newName,
+                            distant=distant)
 
     def rot0(self, fi, name='_rot'):
         """rot(fi) -- rotation of the point about (0, 0).
@@ -162,20 +192,20 @@ class Point3D:
 
         x = self.x; y = self.y; z = self.z
         newName = self.__name__ + name + '(' + str(fi) + ')'
-        newX = x*np.cos(np.deg2rad(fi)) + y*np.sin(np.deg2rad(fi)) ## c. out: 2016.10.3
-        newY = y*np.cos(np.deg2rad(fi)) - x*np.sin(np.deg2rad(fi))  ## c. out: 2016.10.3
-        return Point3D(newX, newY, z, name=newName)
+        cosFi, sinFi = _cosSin(fi)
+        newX = x*cosFi + y*sinFi
+        newY = y*cosFi - x*sinFi
+        return Point3D._new(newX, newY, z, name=newName)
 
     def rot(self, other, fi, name='', color=(0, 0, 1)):
-        """Point rotation about arbitrary point 'other'"""
+        """Point rotation about arbitrary point 'other' (vertical axis),
+        as rot0 about 'other'; see Transform.rotation for any axis"""
 
-        trV = v3d.Vector3D(end=(other.x, other.y, other.z))
-        Pp = self.translate(v=trV*(-1))
-        Pb = Pp.rot0(fi)
-        Presult = Pb.translate(v=trV)
-        Presult.color = color
-        Presult.__name__ = name
-        return Presult
+        x = self.x - other.x; y = self.y - other.y
+        cosFi, sinFi = _cosSin(fi)
+        newX = x*cosFi + y*sinFi + other.x
+        newY = y*cosFi - x*sinFi + other.y
+        return Point3D._new(newX, newY, self.z, name=name, color=color)
 
     def getCTPoint(self, other):
 
@@ -185,8 +215,12 @@ class Point3D:
         ttAngle = np.rad2deg(np.arccos(acos))
         return (self.azimuth, ttAngle)
 
-    def getRange(self, other, dens):
+    def getRange(self, other, dens, asArray=False):
+        """dens + 1 points from self to the other, evenly spaced;
+        a list of Point3D, or a Point3DArray for asArray"""
 
+        if asArray:
+            return Point3DArray([self.coords]).getRange(other, dens)[0]
         ptDif = (other - self)*(1/dens)
         rangeLs = list([self])
         for i in range(1, dens):
@@ -203,7 +237,7 @@ class Point3D:
         newX = (self.x + other.x)/2
         newY = (self.y + other.y)/2
         newZ = (self.z + other.z)/2
-        return Point3D(newX, newY, newZ, 'midP')
+        return Point3D._new(newX, newY, newZ, 'midP')
 
     def getCoordsAr(self):
 
@@ -243,28 +277,31 @@ class Point3D:
 
     def __getitem__(self, index):
 
-        return self.coordsAr[index]
+        return self._coords[index]
 
     def __add__(self, other):
 
         if isinstance(other, Point3D):
-            return Point3D(self.x + other.x, self.y + other.y, self.z + other.z)
+            return Point3D._new(self.x + other.x, self.y + other.y,
+                                self.z + other.z)
         if isinstance(other, numbers.Number):
-            return Point3D(self.x + other, self.y + other, self.z + other)
+            return Point3D._new(self.x + other, self.y + other, self.z + other)
 
     def __sub__(self, other):
 
         if isinstance(other, Point3D):
-            return Point3D(self.x - other.x, self.y - other.y, self.z - other.z)
+            return Point3D._new(self.x - other.x, self.y - other.y,
+                                self.z - other.z)
         if isinstance(other, numbers.Number):
-            return Point3D(self.x - other, self.y - other, self.z - other)
+            return Point3D._new(self.x - other, self.y - other, self.z - other)
 
     def __mul__(self, other):
 
         if isinstance(other, Point3D):
-            return Point3D(self.x*other.x, self.y*other.y, self.z*other.z)
+            return Point3D._new(self.x*other.x, self.y*other.y,
+                                self.z*other.z)
         if isinstance(other, numbers.Number):
-            return Point3D(self.x*other, self.y*other, self.z*other)
+            return Point3D._new(self.x*other, self.y*other, self.z*other)
 
     def __truediv__(self, other):
 
@@ -276,7 +313,7 @@ class Point3D:
                 except ZeroDivisionError:
                     print('Division by zero')
                     results.append(float('inf'))
-            return Point3D(results[0], results[1], results[2])
+            return Point3D._new(results[0], results[1], results[2])
         if isinstance(other, numbers.Number):
             for i in range(len(self.coords)):
                 try:
@@ -284,12 +321,13 @@ class Point3D:
                 except ZeroDivisionError:
                     print('Division by 0')
                     results.append(float('inf'))
-            return Point3D(results[0], results[1], results[2])
+            return Point3D._new(results[0], results[1], results[2])
 
     def __invert__(self):
         #!!! 1/0 !!!
 
-        return Point3D(1/self.x, 1/self.y, 1/self.z, name='inv' + self.nm)
+        return Point3D._new(1/self.x, 1/self.y, 1/self.z,
+                            name='inv' + self.nm)
 
     def __neg__(self):
 
@@ -297,7 +335,7 @@ class Point3D:
         x = coords[0]
         y = coords[1]
         z = coords[2]
-        Pres = Point3D(-x, -y, -z, name=self.name + '_neg')
+        Pres = Point3D._new(-x, -y, -z, name=self.name + '_neg')
         return Pres
 
     def __repr__(self):
@@ -314,6 +352,308 @@ class Point3D:
 # ###/ Point3D /### #
 
 
+# ###/ Point3DArray /### #
+
+
+class Point3DArray:
+    """ An array of 3D points, backed by one contiguous (N, 3) array,
+    with optional name and color columns; the vectorized counterpart of
+    a list of Point3D (see fromPoints, toPoints).
+    """
+
+    def __init__(self, coords, names=None, colors=None, distant=False,
+                 size=20):
+        coords = np.array(coords, dtype=float).reshape(-1, 3)
+        self.coords = np.ascontiguousarray(coords)
+        self.names = None if names is None else _column(names, len(coords))
+        self.colors = None if colors is None else _column(colors,
+                                                          len(coords))
+        self.distant = distant
+        self.size = size
+
+    @classmethod
+    def fromPoints(cls, points):
+        """Point3DArray from a sequence of Point3D"""
+
+        points = list(points)
+        return cls([P.coords for P in points],
+                   names=[P.name for P in points],
+                   colors=[P.color for P in points])
+
+    def toPoints(self):
+        """List of Point3D"""
+
+        return [self[i] for i in range(len(self))]
+
+    @property
+    def x(self):
+        return self.coords[:, 0]
+
+    @property
+    def y(self):
+        return self.coords[:, 1]
+
+    @property
+    def z(self):
+        return self.coords[:, 2]
+
+    @property
+    def azimuth(self):
+        """Returns the solar azimuths of the points (with respect to
+        (0, 0, 0)), as Point3D.azimuth: 270 for y == 0"""
+
+        x, y = self.x, self.y
+        dFi = np.where(y >= 0, pi, np.where(x > 0, 2*pi, 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = np.rad2deg(np.arctan(x/y) + dFi)
+        result[y == 0] = 270
+        return result
+
+    @property
+    def altitude(self):
+        """Returns the solar altitudes of the points (with respect to
+        (0, 0, 0)); +/-90 above/below (0, 0, 0)"""
+
+        d = np.hypot(self.x, self.y)
+        return np.rad2deg(np.arctan2(self.z, d))
+
+    @property
+    def getCPoint(self):
+        """Returns a pair of arrays: solar azimuths and solar altitudes"""
+
+        return (self.azimuth, self.altitude)
+
+    def getPoint0(self):
+        """Gets horizontal projections of the points"""
+
+        coords = self.coords.copy()
+        coords[:, 2] = 0
+        names = None if self.names is None else self.names + '_0'
+        return Point3DArray(coords, names)
+
+    def distance(self, other):
+        """Distances between the points and the other (Point3D or
+        Point3DArray of the same length)"""
+
+        return norm(self.coords - _coords(other), axis=1)
+
+    def translate(self, dx=0, dy=0, dz=0, v=None):
+        """Translation of the points by (dx, dy, dz), or v (Point3D),
+        dx, dy, dz may be arrays (one per point)"""
+
+        if v is not None:
+            dx, dy, dz = v.x, v.y, v.z
+        coords = self.coords.copy()
+        coords[:, 0] += dx
+        coords[:, 1] += dy
+        coords[:, 2] += dz
+        return Point3DArray(coords, distant=self.distant)
+
+    def rot0(self, fi):
+        """Rotation of the points about (0, 0) by fi (degrees),
+        as Point3D.rot0; fi may be an array (one per point)"""
+
+        cosFi, sinFi = _cosSin(fi)
+        coords = self.coords.copy()
+        coords[:, 0] = self.x*cosFi + self.y*sinFi
+        coords[:, 1] = self.y*cosFi - self.x*sinFi
+        return Point3DArray(coords, self.names)
+
+    def rot(self, other, fi, color=(0, 0, 1)):
+        """Rotation of the points about the point 'other' (vertical axis)
+        by fi (degrees)"""
+
+        center = _coords(other)
+        result = (self - center).rot0(fi) + center
+        result.colors = _column([color], len(self))
+        return result
+
+    def getRange(self, other, dens):
+        """Discretization of the segments from the points to the other
+        (Point3D or Point3DArray of the same length), dens + 1 evenly
+        spaced points per segment, as Point3D.getRange.
+
+        dens may be an array (one per segment). The points of the
+        segment i are points[offsets[i]:offsets[i + 1]].
+        Returns: (points, offsets) -- Point3DArray, index array
+        """
+
+        dens = np.asarray(dens)
+        if dens.dtype.kind not in 'iu':
+            raise ValueError("Density should be an integer.")
+        dens = np.broadcast_to(dens, (len(self),))
+        if np.any(dens < 1):
+            raise ValueError("Density should be at least 1.")
+        start = self.coords
+        end = np.broadcast_to(_coords(other), start.shape)
+        counts = dens + 1
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        seg = np.repeat(np.arange(len(self)), counts)
+        j = np.arange(offsets[-1]) - offsets[seg]
+        step = (end - start)*(1/dens)[:, None]
+        coords = start[seg] + step[seg]*j[:, None]
+        coords[offsets[1:] - 1] = end  # the ends exactly
+        return Point3DArray(coords), offsets
+
+    def getMidpoint(self, other):
+        """Gets the midpoints between the points and the other
+        (Point3D or Point3DArray)"""
+
+        return Point3DArray((self.coords + _coords(other))/2,
+                            ['midP']*len(self))
+
+    def __len__(self):
+
+        return len(self.coords)
+
+    def __getitem__(self, index):
+        """Point3D for an integer index, Point3DArray for a slice,
+        an index array or a mask"""
+
+        if isinstance(index, numbers.Integral):
+            x, y, z = self.coords[index].tolist()
+            name = '' if self.names is None else self.names[index]
+            color = (0, 0, 0) if self.colors is None else self.colors[index]
+            return Point3D._new(x, y, z, name, self.distant, self.size, color)
+        return Point3DArray(
+            self.coords[index],
+            None if self.names is None else self.names[index],
+            None if self.colors is None else self.colors[index],
+            self.distant, self.size)
+
+    def __add__(self, other):
+
+        return Point3DArray(self.coords + _coords(other))
+
+    def __sub__(self, other):
+
+        return Point3DArray(self.coords - _coords(other))
+
+    def __mul__(self, other):
+
+        return Point3DArray(self.coords*_coords(other))
+
+    def __truediv__(self, other):
+
+        with np.errstate(divide='ignore'):
+            return Point3DArray(self.coords/_coords(other))
+
+    def __neg__(self):
+
+        names = None if self.names is None else self.names + '_neg'
+        return Point3DArray(-self.coords, names)
+
+    def __repr__(self):
+
+        return f"Point3DArray of {len(self)} points"
+
+
+def _coords(other):
+    """'Internal' method, coordinates of Point3D, Point3DArray or a
+    number, for broadcasting against an (N, 3) array"""
+
+    if isinstance(other, Point3DArray):
+        return other.coords
+    if isinstance(other, Point3D):
+        return np.array(other.coords, dtype=float)
+    return np.asarray(other, dtype=float)
+
+
+def _column(values, n):
+    """'Internal' method, object array of n values (names or colors)"""
+
+    column = np.empty(n, dtype=object)
+    values = list(values)
+    for i in range(n):
+        column[i] = values[i if len(values) == n else 0]
+    return column
+
+# ###/ Point3DArray /### #
+
+
+# ###/ Transform /### #
+
+
+class Transform:
+    """ A rigid transform of 3D points, a 4x4 homogeneous matrix.
+
+    Transforms are composed with `@` (T2 @ T1: T1 first, then T2) and
+    applied to Point3D, Point3DArray or (N, 3) arrays with one matrix
+    product (see apply), e.g. the rotation of a building model about
+    a pivot point, then its translation:
+        T = Transform.rotation(30, pivot=C)
+        T = Transform.translation(10, 0, 0) @ T
+        model1 = T.apply(model)
+    """
+
+    def __init__(self, matrix=None):
+        self.matrix = (np.eye(4) if matrix is None
+                       else np.array(matrix, dtype=float).reshape(4, 4))
+
+    @classmethod
+    def translation(cls, dx=0, dy=0, dz=0, v=None):
+        """Translation by (dx, dy, dz), or v (Point3D)"""
+
+        if v is not None:
+            dx, dy, dz = v.x, v.y, v.z
+        T = cls()
+        T.matrix[:3, 3] = dx, dy, dz
+        return T
+
+    @classmethod
+    def rotation(cls, fi, axis=(0, 0, 1), pivot=None):
+        """Rotation by fi (degrees) about the axis (x, y, z) through the
+        pivot point (Point3D, default (0, 0, 0)), Rodrigues' formula;
+        in the sense of Point3D.rot0 for the vertical axis"""
+
+        k = np.array(axis, dtype=float)
+        k /= norm(k)
+        cosFi, sinFi = _cosSin(-fi)
+        K = np.array([[0, -k[2], k[1]], [k[2], 0, -k[0]], [-k[1], k[0], 0]])
+        T = cls()
+        T.matrix[:3, :3] = (np.eye(3)*cosFi + K*sinFi
+                            + np.outer(k, k)*(1 - cosFi))
+        if pivot is not None:
+            T = cls.translation(v=pivot) @ T @ cls.translation(v=-pivot)
+        return T
+
+    def inverse(self):
+        """The inverse transform"""
+
+        return Transform(np.linalg.inv(self.matrix))
+
+    def apply(self, points):
+        """Transformed points: Point3D, Point3DArray or an (N, 3) array,
+        one matrix product for all the points"""
+
+        R, t = self.matrix[:3, :3], self.matrix[:3, 3]
+        if isinstance(points, Point3D):
+            x, y, z = (R @ points.coords + t).tolist()
+            return Point3D._new(x, y, z, points.name, points.distant,
+                                points.size, points.color)
+        if isinstance(points, Point3DArray):
+            return Point3DArray(points.coords @ R.T + t, points.names,
+                                points.colors, points.distant, points.size)
+        return np.asarray(points, dtype=float) @ R.T + t
+
+    def __matmul__(self, other):
+
+        return Transform(self.matrix @ other.matrix)
+
+    def __repr__(self):
+
+        return f"Transform(\n{self.matrix})"
+
+
+def _cosSin(fi):
+    """'Internal' method, cos and sin of the angle fi (degrees)"""
+
+    fi = np.deg2rad(fi)
+    return np.cos(fi), np.sin(fi)
+
+# ###/ Transform /### #
+
+
 if __name__ == '__main__':
     print(filename + ' demo')
     from Point3D import Point3D
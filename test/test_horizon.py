@@ -0,0 +1,66 @@
+# test_horizon.py
+
+import numpy as np
+from numpy import random as npr
+import unittest
+
+import khelio as kh
+import point3d as p3
+from horizon import HorizonProfile
+
+NR_TST = 1000
+
+
+class HorizonProfileUnitTest(unittest.TestCase):
+
+    def test_blocked(self):
+        pts = npr.randn(NR_TST, 3)*[10, 10, 3] + [5, -20, 5]
+        observer = p3.Point3D(0.0, 0.0, 1.5)
+        hp = HorizonProfile(pts, observer, 2)
+        PA = p3.Point3DArray(pts) - observer
+        AZI0 = getAzimuth(PA) % 360
+        AZIs = npr.random(NR_TST)*360
+        ALTs = npr.random(NR_TST)*90
+        blocked0 = [np.any((AZI0//2 == AZI//2) & (PA.altitude > ALT))
+                    for AZI, ALT in zip(AZIs, ALTs)]
+        self.assertEqual(hp.blocked(AZIs, ALTs).tolist(), blocked0)
+        self.assertTrue(np.all(hp.elevation(AZIs + 360)
+                               == hp.elevation(AZIs)))
+
+    def test_add(self):
+        pts = [p3.Point3D(*P) for P in npr.randn(NR_TST, 3).tolist()]
+        hp = HorizonProfile(pts, resolution=0.5)
+        hp1 = HorizonProfile(resolution=0.5)
+        self.assertTrue(np.all(hp1.profile == -90))
+        hp1.add(pts[:NR_TST//2]).add(p3.Point3DArray.fromPoints(
+            pts[NR_TST//2:]))
+        self.assertTrue(np.array_equal(hp.profile, hp1.profile))
+        self.assertRaises(ValueError, HorizonProfile, resolution=7)
+
+    def test_axes(self):
+        # level with the observer in y: due east and due west
+        east = HorizonProfile([(-10, 0, 10)])
+        self.assertTrue(east.blocked(90, 30))
+        self.assertFalse(east.blocked(270, 30))
+        west = HorizonProfile([p3.Point3D(10.0, 0.0, 10.0)])
+        self.assertEqual(west.blocked([90, 270], 30).tolist(), [False, True])
+        # the North and the South (x == 0)
+        hp = HorizonProfile([(0, -10, 10), (0, 10, 1)], resolution=0.5)
+        self.assertTrue(np.allclose(hp.elevation([0, 180, 90]),
+                                    [45, np.degrees(np.arctan(0.1)), -90]))
+        # the same convention as khelio.azi: the sun at HRA -90, 90 on the
+        # equator at the equinox is in the East (x = -1), the West (x = 1)
+        self.assertTrue(np.allclose(kh.azi(0, 0, np.array([-90, 90])),
+                                    [90, 270]))
+        self.assertTrue(HorizonProfile([(-10, 0, 10)]).blocked(
+            kh.azi(0, 0, -90), 30))
+
+
+def getAzimuth(PA):
+    """Azimuths of the points, as khelio.azi (from the North, clockwise)"""
+
+    return np.degrees(np.arctan2(-PA.x, -PA.y))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,145 @@
+# test_point3d.py
+
+import numpy as np
+from numpy import random as npr
+import unittest
+
+import point3d as p3
+
+ERR_MARGIN = 0.000_000_000_001  # max error
+NR_TST = 1000
+
+
+class Point3DUnitTest(unittest.TestCase):
+
+    def test_slots(self):
+        P = p3.Point3D(1.0, 2.0, 3.0, 'A', color=(1, 0, 0))
+        self.assertFalse(hasattr(P, '__dict__'))
+        self.assertEqual((P.__name__, P.__clr__), ('A', (1, 0, 0)))
+        self.assertEqual(P.coordsAr, [1.0, 2.0, 3.0])
+        P.__name__, P.z = 'B', 5.0
+        self.assertEqual((P.name, P.coords, P[2]),
+                         ('B', (1.0, 2.0, 5.0), 5.0))
+        self.assertRaises(TypeError, p3.Point3D, 'x')
+        Q = P + p3.Point3D(1.0, 1.0, 1.0)
+        self.assertIsInstance(Q, p3.Point3D)
+        self.assertEqual((Q.coords, Q.name, Q.size, Q.distant),
+                         ((2.0, 3.0, 6.0), '', 20, False))
+        P.coordsAr = [4.0, 2.0, 5.0]
+        self.assertEqual((P.x, P.coords), (4.0, (4.0, 2.0, 5.0)))
+
+
+class Point3DArrayUnitTest(unittest.TestCase):
+
+    def test_angles(self):
+        pts = getPoints(NR_TST)
+        pts += [p3.Point3D(1.0, 0.0, 1.0), p3.Point3D(-1.0, 0.0, -1.0)]
+        PA = p3.Point3DArray.fromPoints(pts)
+        self.assertEqual(len(PA), NR_TST + 2)
+        self.assertTrue(np.allclose(PA.azimuth, [P.azimuth for P in pts],
+                                    rtol=0, atol=ERR_MARGIN))
+        self.assertTrue(np.allclose(PA.altitude,
+                                    [P.altitude for P in pts],
+                                    rtol=0, atol=ERR_MARGIN))
+
+    def test_transforms(self):
+        pts = getPoints(NR_TST)
+        PA = p3.Point3DArray.fromPoints(pts)
+        C = p3.Point3D(*npr.randn(3).tolist())
+        fi = npr.random()*360
+        for result, results0 in (
+                (PA.rot0(fi), [P.rot0(fi) for P in pts]),
+                (PA.rot(C, fi), [P.rot(C, fi) for P in pts]),
+                (PA.translate(1, 2, 3), [P.translate(1, 2, 3) for P in pts]),
+                (PA.translate(v=C), [P.translate(v=C) for P in pts]),
+                (PA.getMidpoint(C), [P.getMidpoint(C) for P in pts]),
+                (PA + C, [P + C for P in pts]),
+                (PA - 2.0, [P - 2.0 for P in pts]),
+                (PA*C, [P*C for P in pts]),
+                (PA/C, [P/C for P in pts]),
+                (-PA, [-P for P in pts])):
+            self.assertTrue(np.allclose(result.coords,
+                                        [P.coords for P in results0],
+                                        rtol=0, atol=ERR_MARGIN))
+        self.assertTrue(np.allclose(PA.distance(C),
+                                    [P.distance(C) for P in pts],
+                                    rtol=0, atol=ERR_MARGIN))
+
+    def test_points(self):
+        pts = getPoints(10)
+        PA = p3.Point3DArray.fromPoints(pts)
+        for P0, P1 in zip(pts, PA.toPoints()):
+            self.assertEqual(P0.coords, P1.coords)
+            self.assertEqual(P0.name, P1.name)
+            self.assertEqual(P0.color, P1.color)
+        self.assertEqual(PA[3].name, 'P3')
+        sub = PA[PA.z > 0]
+        self.assertIsInstance(sub, p3.Point3DArray)
+        self.assertEqual(len(sub), sum(P.z > 0 for P in pts))
+
+    def test_getRange(self):
+        starts, ends = getPoints(100), getPoints(100)
+        dens = npr.randint(1, 30, 100)
+        PA, offsets = p3.Point3DArray.fromPoints(starts).getRange(
+            p3.Point3DArray.fromPoints(ends), dens)
+        self.assertEqual(len(PA), (dens + 1).sum())
+        for i, (P, Q) in enumerate(zip(starts, ends)):
+            results0 = [R.coords for R in P.getRange(Q, int(dens[i]))]
+            self.assertTrue(np.array_equal(
+                PA.coords[offsets[i]:offsets[i + 1]], results0))
+            self.assertTrue(np.array_equal(
+                P.getRange(Q, int(dens[i]), asArray=True).coords, results0))
+        PA, offsets = p3.Point3DArray.fromPoints(starts).getRange(ends[0], 4)
+        self.assertEqual(offsets[-1], 500)
+        self.assertRaises(ValueError, starts[0].getRange, ends[0], 0, True)
+        for dens in (2.7, 2.0, [3, 2.5]):
+            self.assertRaises(ValueError, starts[0].getRange, ends[0], dens,
+                              True)
+
+
+class TransformUnitTest(unittest.TestCase):
+
+    def test_rotation(self):
+        pts = getPoints(NR_TST)
+        PA = p3.Point3DArray.fromPoints(pts)
+        C = p3.Point3D(*npr.randn(3).tolist())
+        fi = npr.random()*360
+        T = p3.Transform.rotation(fi, pivot=C)
+        self.assertTrue(np.allclose(T.apply(PA).coords,
+                                    [P.rot(C, fi).coords for P in pts],
+                                    rtol=0, atol=ERR_MARGIN))
+        self.assertTrue(np.allclose(p3.Transform.rotation(fi).apply(PA.coords),
+                                    PA.rot0(fi).coords,
+                                    rtol=0, atol=ERR_MARGIN))
+        axis = npr.randn(3)
+        R = p3.Transform.rotation(fi, axis, C)
+        self.assertTrue(np.allclose(R.matrix[:3, :3] @ R.matrix[:3, :3].T,
+                                    np.eye(3)))
+        self.assertAlmostEqual(np.linalg.det(R.matrix[:3, :3]), 1)
+        Q = C + p3.Point3D(*axis.tolist())  # on the axis
+        self.assertTrue(np.allclose(R.apply(Q).coords, Q.coords))
+
+    def test_compose(self):
+        PA = p3.Point3DArray.fromPoints(getPoints(NR_TST))
+        T1 = p3.Transform.rotation(30, (1, 2, 3), p3.Point3D(1.0, 0.0, 0.0))
+        T2 = p3.Transform.translation(1, 2, 3)
+        T = T2 @ T1
+        self.assertTrue(np.allclose(T.apply(PA).coords,
+                                    T2.apply(T1.apply(PA)).coords))
+        self.assertTrue(np.allclose(T.inverse().apply(T.apply(PA)).coords,
+                                    PA.coords))
+        P = T.apply(PA[0])
+        self.assertIsInstance(P, p3.Point3D)
+        self.assertEqual(P.name, 'P0')
+        self.assertTrue(np.allclose(P.coords, T.apply(PA).coords[0]))
+
+
+def getPoints(n):
+    """List of n random Point3D"""
+
+    return [p3.Point3D(x, y, z, f'P{i}', color=(i/n, 0, 0))
+            for i, (x, y, z) in enumerate(npr.randn(n, 3).tolist())]
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
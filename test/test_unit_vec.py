@@ -0,0 +1,474 @@
+# test_unit_vec.py
+
+import numpy as np
+from datetime import date, datetime, timedelta
+from numpy import random as npr
+import threading
+import tracemalloc
+import unittest
+
+import khelio as kh0
+
+ERR_MARGIN = 0.000_000_000_001  # max error
+NR_TST = 1000
+
+
+class KhelioVecUnitTest(unittest.TestCase):
+
+    def test_hra(self):
+        hrs = npr.random(NR_TST)*48 - 24
+        HRAS0 = [kh0.hra(float(h)) for h in hrs]
+        HRAS1 = kh0.hra(hrs)
+        self.assertIsInstance(HRAS1, np.ndarray)
+        self.assertTrue(np.allclose(HRAS0, HRAS1, rtol=0, atol=ERR_MARGIN))
+        HRAS2 = kh0.hra(hrs.reshape(10, -1), dtype=np.float32)
+        self.assertEqual(HRAS2.dtype, np.float32)
+        self.assertEqual(HRAS2.shape, (10, NR_TST//10))
+
+    def test_hr(self):
+        HRAS = npr.random(NR_TST)*360 - 180
+        self.assertTrue(np.allclose(kh0.hra(kh0.hr(HRAS)), HRAS,
+                                    rtol=0, atol=ERR_MARGIN))
+        self.assertIsInstance(kh0.hr(15.0), float)
+
+    def test_dayNr(self):
+        ord0, ord1 = date(1900, 1, 1).toordinal(), date(2100, 12, 31).toordinal()
+        dates = [date.fromordinal(o) for o in npr.randint(ord0, ord1, NR_TST)]
+        results0 = [int(dt.strftime("%-j")) for dt in dates]
+        mds = np.array([(dt.month, dt.day) for dt in dates])
+        yrs = np.array([dt.year for dt in dates])
+        self.assertEqual(kh0.dayNr(mds, year=yrs).tolist(), results0)
+        self.assertEqual(kh0.dayNr(np.array(dates, dtype='M8[D]')).tolist(),
+                         results0)
+        self.assertEqual(kh0.dayNr(mds[:, 0], mds[:, 1], year=yrs).tolist(),
+                         results0)
+        self.assertEqual(kh0.dayNr(((1, 2), (3, 4))).tolist(), [2, 63])
+        self.assertEqual(kh0.dayNr(((1, 2), (3, 4), (5, 6))).tolist(),
+                         [2, 63, 126])
+        self.assertEqual(kh0.dayNr((3, 1), year=2024), 61)
+        for args in ((0, 5), (13, 1), (2, 0), ((1, 32),),
+                     (np.array([1, 13]), np.array([1, 1]))):
+            self.assertRaises(ValueError, kh0.dayNr, *args)
+        mdsSt = np.array([tuple(md) for md in mds],
+                         dtype=[('m', int), ('d', int)])
+        self.assertEqual(kh0.dayNr(mdsSt, year=yrs).tolist(), results0)
+        self.assertEqual(kh0.dayNr(3, 1, year=2024), 61)
+
+    def test_solarAngles(self):
+        dnrs = npr.randint(1, 366, NR_TST)
+        hrs = npr.random(NR_TST)*24
+        LAT, TIL, ORI = getRandLATTILORI(NR_TST)
+        results = kh0.solarAngles(dnrs, hrs, LAT, TIL, ORI)
+        DEC = kh0.dec(dnrs)
+        HRA = kh0.hra(hrs)
+        results0 = {'DEC': DEC, 'HRA': HRA, 'ZEN': kh0.zen(DEC, LAT, HRA),
+                    'ALT': kh0.alt(DEC, LAT, HRA, dtype=np.float64),
+                    'AZI': kh0.azi(DEC, LAT, HRA),
+                    'INC': kh0.inc(DEC, LAT, TIL, ORI, HRA)}
+        for name in kh0.ANGLES:
+            self.assertTrue(np.allclose(results0[name], results[name],
+                                        rtol=0, atol=1e-9), name)
+        results = kh0.solarAngles(dnrs, hrs, LAT, angles=('ZEN',))
+        self.assertEqual(list(results), ['ZEN'])
+
+    def test_out_ws(self):
+        DEC = kh0.dec(npr.randint(1, 366, NR_TST))
+        HRA = kh0.hra(npr.random(NR_TST)*24)
+        LAT, TIL, ORI = getRandLATTILORI(NR_TST)
+        ws = kh0.Workspace()
+        out = np.empty(NR_TST)
+        for i in range(3):
+            INC = kh0.inc(DEC, LAT, TIL + i, ORI, HRA, out=out, ws=ws)
+            self.assertIs(INC, out)
+            self.assertTrue(np.array_equal(INC, kh0.inc(DEC, LAT, TIL + i,
+                                                        ORI, HRA)))
+        nbytes = ws.nbytes
+        ZEN = kh0.zen(DEC, LAT, HRA, out=out, ws=ws)
+        self.assertTrue(np.array_equal(ZEN, kh0.zen(DEC, LAT, HRA)))
+        self.assertEqual(nbytes, ws.nbytes)
+        # steady state: no allocation of the size of the arrays
+        DEC, HRA, out = (np.repeat(x, 100) for x in (DEC, HRA, out))
+        for fun in (kh0.zen, kh0.azi):
+            fun(DEC, 52, HRA, out=out, ws=ws)
+            tracemalloc.start()
+            fun(DEC, 52, HRA, out=out, ws=ws)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.assertLess(peak, 10*NR_TST)
+
+    def test_precision(self):
+        dnrs = npr.randint(1, 366, NR_TST)
+        hrs = npr.random(NR_TST)*24
+        LAT, TIL, ORI = getRandLATTILORI(NR_TST)
+        results64 = kh0.solarAngles(dnrs, hrs, LAT, TIL, ORI)
+        prev = kh0.setPrecision(np.float32)
+        try:
+            results32 = kh0.solarAngles(dnrs, hrs, LAT, TIL, ORI)
+            DEC = kh0.dec(dnrs)
+            HRA = kh0.hra(hrs)
+            angles = [DEC, HRA, kh0.zen(DEC, LAT, HRA),
+                      kh0.alt(DEC, LAT, HRA), kh0.inc(DEC, LAT, TIL, ORI, HRA)]
+        finally:
+            kh0.setPrecision(prev)
+        for ANG in list(results32.values()) + angles:
+            self.assertEqual(ANG.dtype, np.float32)
+        for name in kh0.ANGLES:
+            self.assertTrue(np.allclose(results32[name], results64[name],
+                                        rtol=0, atol=0.03), name)
+        self.assertEqual(kh0.alt(1, 52, 0).dtype, np.float64)
+
+    def test_dayTable(self):
+        dnrs = npr.randint(1, 367, NR_TST)
+        for fun in (kh0.dec, kh0.et):
+            self.assertTrue(np.array_equal(fun(dnrs, table=True), fun(dnrs)))
+            dnrsF = dnrs + npr.random(NR_TST)
+            results = fun(dnrsF, table=kh0.DayTable(fun, interp=True))
+            self.assertTrue(np.allclose(results, fun(dnrsF), rtol=0,
+                                        atol=0.01))
+        for table in (kh0.DayTable(kh0.dec), kh0.DayTable(kh0.et, True)):
+            for dn in (-3, 367, np.array([1, -1])):
+                self.assertRaises(ValueError, table, dn)
+        self.assertEqual(kh0.DayTable(kh0.dec)(366), kh0.dec(366))
+
+    def test_et(self):
+        dnrs = npr.randint(1, 367, NR_TST)
+        for fun in (kh0.et, kh0.et1, kh0.et2, kh0.Et, kh0.Eteq):
+            ETS0 = [fun(int(dnr)) for dnr in dnrs]
+            self.assertTrue(np.allclose(ETS0, fun(dnrs), rtol=0,
+                                        atol=ERR_MARGIN), fun.__name__)
+
+    def test_ast1(self):
+        dnrs = npr.randint(1, 367, NR_TST)
+        LSTS = npr.random(NR_TST)*24
+        LON, LONStd = 21, 15
+        ASTS0 = [LST + (LON - LONStd)/15 + kh0.et2(int(dnr))/60
+                 for (LST, dnr) in zip(LSTS, dnrs)]
+        ASTS1 = kh0.ast1(LSTS, dnrs, LON, LONStd, teq=kh0.ET2)
+        self.assertTrue(np.allclose(ASTS0, ASTS1, rtol=0, atol=ERR_MARGIN))
+        ASTS2 = kh0.ast1(LSTS, dnrs, LON, LONStd, teq=kh0.DayTable(kh0.et2))
+        self.assertTrue(np.array_equal(ASTS1, ASTS2))
+
+    def test_azi(self):
+        DEC = kh0.dec(npr.randint(1, 366, NR_TST))
+        HRA = kh0.hra(npr.random(NR_TST)*24)
+        LAT, _, _ = getRandLATTILORI(NR_TST)
+        AZIS0 = [getAzimuth(*vals) for vals in zip(DEC, LAT, HRA)]
+        AZIS1 = kh0.azi(DEC, LAT, HRA)
+        self.assertTrue(np.allclose(AZIS0, AZIS1, rtol=0, atol=1e-9))
+        self.assertEqual(kh0.azi(0, 52, 0), 180)
+        AZI = kh0.azi(23, 10, np.array([-1e-20, 1e-20, 0.0]))  # the north
+        self.assertTrue(np.all((AZI >= 0) & (AZI < 360)))
+
+    def test_solarPositionSeries(self):
+        LAT, LON, tz = 52, 21, 1
+        sps = kh0.SolarPositionSeries.range('2024-01-01', '2025-01-01',
+                                            np.timedelta64(7, 'm'), LAT, LON,
+                                            tz=tz)
+        self.assertEqual(set(sps.columns('ALT')), {'ALT'})
+        self.assertNotIn('AZI', sps.__dict__)
+        for i in npr.randint(0, len(sps), 20):
+            dttm = sps.times[i].astype(datetime) + timedelta(hours=tz)
+            dnr = int(dttm.strftime("%-j"))
+            AST = kh0.ast1(dttm.hour + dttm.minute/60, dnr, LON, 15*tz)
+            DEC, HRA = kh0.dec(dnr), kh0.hra(AST)
+            self.assertEqual(sps.dn[i], dnr)
+            self.assertAlmostEqual(sps.ALT[i], kh0.alt(DEC, LAT, HRA))
+            self.assertAlmostEqual(sps.ZEN[i], kh0.zen(DEC, LAT, HRA))
+            self.assertAlmostEqual(sps.AZI[i], kh0.azi(DEC, LAT, HRA))
+        for shift in (1, -1):  # two lambdas, not one table of '<lambda>'
+            sps1 = kh0.SolarPositionSeries(
+                sps.times[:100], LAT, LON, tz=tz,
+                teq=lambda dn, dtype=None, s=shift: kh0.et(dn, dtype) + 60*s)
+            self.assertTrue(np.allclose(sps1.AST - sps.AST[:100], shift))
+
+    def test_solarPositionChunks(self):
+        args = ('2023-06-01', '2023-06-08', np.timedelta64(1, 'm'), 52, 21)
+        columns = ('AST', 'ZEN', 'ALT', 'AZI')
+        sps = kh0.SolarPositionSeries.range(*args, tz=1)
+        for chunk in (997, np.timedelta64(1, 'D')):
+            chunks = list(kh0.solarPositionChunks(*args, tz=1,
+                                                  columns=columns,
+                                                  chunk=chunk))
+            self.assertTrue(all(len(ch['times']) <= 1440 for ch in chunks))
+            self.assertTrue(np.array_equal(
+                np.concatenate([ch['times'] for ch in chunks]), sps.times))
+            for name in columns:
+                self.assertTrue(np.array_equal(
+                    np.concatenate([ch[name] for ch in chunks]), sps[name]))
+
+    def test_incSurfaces(self):
+        nrT, nrN = NR_TST, 50
+        DEC = kh0.dec(npr.randint(1, 366, nrT))
+        HRA = kh0.hra(npr.random(nrT)*24)
+        LAT, TIL, ORI = getRandLATTILORI(nrN)
+        INC = kh0.incSurfaces(DEC, LAT, TIL, ORI, HRA)
+        self.assertEqual(INC.shape, (nrN, nrT))
+        for n in npr.randint(0, nrN, 5):
+            self.assertTrue(np.allclose(INC[n], kh0.inc(DEC, LAT[n], TIL[n],
+                                                        ORI[n], HRA),
+                                        rtol=0, atol=1e-9))
+        INC1 = np.full((nrN, nrT), np.nan)
+        for ns, ts, block in kh0.incTiles(DEC, LAT, TIL, ORI, HRA,
+                                          tileN=16, tileT=300):
+            INC1[ns, ts] = block
+        self.assertTrue(np.array_equal(INC, INC1))
+
+    def test_solarScene(self):
+        times = np.arange('2023-03-01', '2023-03-08', dtype='M8[m]')
+        scene = kh0.SolarScene(times, 52, 21, tz=1)
+        sps = kh0.SolarPositionSeries(times, 52, 21, tz=1)
+        for TIL, ORI in zip(*getRandLATTILORI(5)[1:]):
+            scene.update(TIL=TIL, ORI=ORI)
+            self.assertTrue(np.allclose(scene.INC, kh0.inc(sps.DEC, 52, TIL,
+                                                           ORI, sps.HRA),
+                                        rtol=0, atol=1e-9))
+        self.assertTrue(np.array_equal(scene.ALT, sps.ALT))
+        self.assertEqual(scene.counts, {'time': 1, 'solar': 1, 'angles': 1,
+                                        'sun': 1, 'inc': 5})
+        scene.LAT = 50
+        scene.INC
+        self.assertEqual(scene.counts['angles'], 1)
+        self.assertEqual(scene.counts['sun'], 2)
+        previous = kh0.setPrecision(np.float32)
+        try:  # the precision of the scene is resolved when it is set
+            scene.TIL = 10
+            self.assertEqual((scene.ALT.dtype, scene.INC.dtype),
+                             (previous, previous))
+        finally:
+            kh0.setPrecision(previous)
+
+    def test_trigCache(self):
+        cache = kh0.TrigCache(maxsize=8)
+        HRA = kh0.hra(npr.random(NR_TST)*24)
+        for i in range(NR_TST//100):
+            args = getINCArgs()
+            INC = kh0.inc(*args[:4], HRA, cache=cache)
+            self.assertTrue(np.array_equal(INC, kh0.inc(*args[:4], HRA)))
+            self.assertTrue(np.array_equal(kh0.inc(*args[:4], HRA,
+                                                   cache=cache), INC))
+        info = cache.info()
+        self.assertEqual(info['currsize'], 8)
+        self.assertGreaterEqual(info['hits'], 3*NR_TST//100)
+        results = kh0.solarAngles(100, HRA, 52, 30, 5, cache=cache)
+        results0 = kh0.solarAngles(100, HRA, 52, 30, 5)
+        for name in kh0.ANGLES:
+            self.assertTrue(np.array_equal(results[name], results0[name]))
+        self.assertTrue(results['DEC'].flags.writeable)
+        # shared by threads: the same results, no errors
+        args = [(float(DEC), float(LAT), 30.0, 0.0, 15.0)
+                for DEC, LAT in npr.randint(-20, 20, (2000, 2))]
+        results0 = [kh0.inc(*arg) for arg in args]
+        cache, results = kh0.TrigCache(maxsize=8), [None]*len(args)
+
+        def work(k):
+            for i in range(k, len(args), 4):
+                results[i] = kh0.inc(*args[i], cache=cache)
+
+        threads = [threading.Thread(target=work, args=(k,)) for k in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, results0)
+        self.assertLessEqual(cache.info()['currsize'], 8)
+
+    def test_sunTimes(self):
+        dnrs = npr.randint(1, 366, 50)
+        LAT = npr.random(50)*180 - 90
+        hrs = np.arange(0, 24, 1/60) + 1/120
+        ALT = kh0.alt(kh0.dec(dnrs)[:, None], LAT[:, None], kh0.hra(hrs))
+        rise, sset = kh0.sunTimes(dnrs, LAT)
+        dl = kh0.dayLength(dnrs, LAT)
+        self.assertTrue(np.allclose(sset - rise, dl, rtol=0, atol=ERR_MARGIN))
+        self.assertTrue(np.allclose((ALT > 0).sum(axis=1)/60, dl, rtol=0,
+                                    atol=1/30))
+        self.assertEqual(kh0.dayLength(172, 80), 24)
+        self.assertEqual(kh0.dayLength(355, 80), 0)
+        for dtype in (np.float32, np.float64):  # the poles
+            self.assertEqual(kh0.dayLength([172, 355], 90, dtype).tolist(),
+                             [24, 0])
+            self.assertEqual(kh0.dayLength([172, 355], -90, dtype).tolist(),
+                             [0, 24])
+        self.assertRaises(ValueError, kh0.sunTimes, 172, 52, 21)
+        self.assertRaises(ValueError, kh0.DaytimeGrid, [172], 52, 10, 21)
+        riseLST, _ = kh0.sunTimes(dnrs, LAT, 21, 15)
+        self.assertTrue(np.allclose(kh0.ast1(riseLST, dnrs, 21, 15), rise,
+                                    rtol=0, atol=ERR_MARGIN))
+
+    def test_daytimeGrid(self):
+        days = np.arange(1, 366)
+        for LAT, LON in ((52, None), (-35, 151), (80, 21)):
+            grid = kh0.DaytimeGrid(days, LAT, 5, LON, 15)
+            ALT = kh0.alt(grid.DEC, LAT, grid.HRA)
+            self.assertGreater(ALT.min(), -1e-9)
+            hours = np.arange(0, 24, 5/60)
+            AST = (hours if LON is None else
+                   kh0.ast1(hours, days[:, None], LON, 15))
+            ALTFull = kh0.alt(kh0.dec(days)[:, None], LAT, kh0.hra(AST))
+            full = grid.scatter(ALT)
+            self.assertEqual(full.shape, ALTFull.shape)
+            day = ~np.isnan(full)
+            self.assertTrue(np.allclose(full[day], ALTFull[day], rtol=0,
+                                        atol=ERR_MARGIN))
+            self.assertTrue(np.all(ALTFull[~day] < 1e-9))
+            self.assertEqual(len(grid), grid.offsets[-1])
+            self.assertTrue(np.array_equal(np.diff(grid.offsets),
+                                           day.sum(axis=1)))
+            self.assertTrue(np.array_equal(grid.dn,
+                                           np.repeat(days, day.sum(axis=1))))
+
+    def test_etrDay(self):
+        h = (np.arange(8640) + 0.5)/360  # every 10 s
+        HRA = kh0.hra(h)
+        for LAT, TIL, ORI in zip(*getRandLATTILORI(20)):
+            dn = npr.randint(1, 366)
+            DEC = kh0.dec(dn)
+            cosINC = np.cos(np.radians(kh0.inc(DEC, LAT, TIL, ORI, HRA)))
+            lit = (cosINC > 0) & (kh0.alt(DEC, LAT, HRA) > 0)
+            H = kh0.Gsc*kh0.E0(dn)*np.where(lit, cosINC, 0).sum()/360
+            # sunrise/sunset steps: Gsc*E0*(5 s) at most
+            self.assertAlmostEqual(kh0.etrDay(dn, LAT, TIL, ORI), H,
+                                   delta=4.5)
+        LAT = np.array([-45, 0, 52])
+        H0 = kh0.etrDay(np.arange(1, 366), LAT[:, None])
+        self.assertEqual(H0.shape, (3, 365))
+        self.assertTrue(np.allclose(kh0.etrDay(172, LAT, 0, 0),
+                                    kh0.etrDay(172, LAT, 1e-9, 0)))
+        HM = kh0.etrMonth(LAT, 30, 0)
+        self.assertEqual(HM.shape, (3, 12))
+        self.assertEqual(HM[2, 5], kh0.etrDay(kh0.dayNr(6, 11), 52, 30, 0))
+        for dtype in kh0.PRECISIONS:
+            self.assertEqual(kh0.etrDay(172, LAT, 30, 0, dtype).dtype, dtype)
+            self.assertEqual(kh0.etrMonth(LAT, 30, 0, dtype).dtype, dtype)
+
+    def test_repDays(self):
+        LAT, TIL, ORI = getRandLATTILORI(10)
+        for days in (kh0.rMDays, kh0.days7, kh0.days3):
+            dn, weights, assign = kh0.repDays(days)
+            self.assertEqual(weights.sum(), 365)
+            self.assertTrue(np.array_equal(assign[dn - 1], range(len(dn))))
+            prof = kh0.repDayProfiles(LAT, TIL, ORI, days, step=15)
+            self.assertEqual(prof['G'].shape, (10, len(dn), 96))
+            self.assertGreaterEqual(prof['G'].min(), 0)
+            res = kh0.repDayTotals(LAT, TIL, ORI, days, step=15, full=True)
+            self.assertTrue(np.allclose(res['daily'],
+                                        prof['G'].sum(-1)/4))
+            self.assertTrue(np.allclose(res['periodsFull'].sum(-1),
+                                        res['yearFull']))
+            # sunrise/sunset steps: Gsc*E0*(step/2) at most, each
+            H = kh0.etrDay(dn, LAT[:, None], TIL[:, None], ORI[:, None])
+            daily = kh0.repDayTotals(LAT, TIL, ORI, days, step=1)['daily']
+            self.assertTrue(np.allclose(daily, H, rtol=0,
+                                        atol=1.034*kh0.Gsc/60))
+        self.assertTrue(np.array_equal(kh0.repDays()[1],
+                                       [31, 28, 31, 30, 31, 30,
+                                        31, 31, 30, 31, 30, 31]))
+        res = kh0.repDayTotals([0, 30, 52], 30, 0, full=True)
+        self.assertTrue(np.all(np.abs(res['yearError']) < 0.01))
+
+    def test_optimalSurface(self):
+        grid = kh0.DaytimeGrid(np.arange(1, 366, 7), 0, 30)
+        DEC, HRA = grid.DEC, grid.HRA
+        LAT, TIL, ORI = getRandLATTILORI(5)
+        w = npr.random((5, len(DEC)))
+        cosINC = np.cos(np.radians(kh0.inc(DEC, LAT[:, None], TIL[:, None],
+                                           ORI[:, None], HRA)))
+        cosINC *= kh0.alt(DEC, LAT[:, None], HRA) > 0
+        sums = kh0.cosIncSum(LAT, TIL, ORI, DEC, HRA, w, tileT=1000)
+        self.assertTrue(np.allclose(sums, (np.maximum(cosINC, 0)*w).sum(1)))
+        LAT = np.array([-30, 0, 45])
+        res = kh0.optimalSurface(LAT, DEC, HRA, ORI=(-90, 90))
+        TILs, ORIs = np.meshgrid(np.arange(0, 91), np.arange(-90, 91))
+        for i, lat in enumerate(LAT):
+            sums = kh0.cosIncSum(lat, TILs, ORIs, DEC, HRA)
+            self.assertGreaterEqual(res['value'][i], sums.max()*(1 - 1e-4))
+        self.assertTrue(np.all(res['ORI'] <= 90))
+
+    def test_tracking(self):
+        DEC = kh0.dec(npr.randint(1, 366, NR_TST))
+        LAT = npr.random(NR_TST)*180 - 90
+        HRA = kh0.hra(npr.random(NR_TST)*24)
+        up = kh0.alt(DEC, LAT, HRA) > 0
+        AXT, AXO = npr.random(NR_TST)*60, npr.random(NR_TST)*360 - 180
+        res = kh0.trackSingle(DEC, LAT, HRA, AXT, AXO)
+        INC = kh0.inc(DEC, LAT, res['TIL'], res['ORI'], HRA)
+        self.assertTrue(np.allclose(INC, res['INC'], rtol=0, atol=1e-6))
+        self.assertTrue(np.all(res['ROT'][~up] == 0))
+        for ROT in np.linspace(-90, 90, 19):  # the best rotation
+            ROTd = kh0.trackSingle(DEC, LAT, HRA, AXT, AXO, maxAngle=abs(ROT))
+            self.assertTrue(np.all(res['INC'][up]
+                                   <= ROTd['INC'][up] + ERR_MARGIN))
+        res = kh0.trackSingle(DEC, LAT, HRA, maxAngle=45, gcr=0.5)
+        self.assertTrue(np.all(np.abs(res['ROT']) <= 45 + ERR_MARGIN))
+        ideal = kh0.trackSingle(DEC, LAT, HRA)['ROT']
+        self.assertTrue(np.all(np.abs(res['ROT']) <= np.abs(ideal)))
+        self.assertTrue(np.all(res['ROT']*ideal >= 0))
+        res = kh0.trackDual(DEC, LAT, HRA)
+        self.assertTrue(np.allclose(res['INC'][up], 0, atol=1e-5))
+        self.assertTrue(np.allclose(res['INC'][~up],
+                                    kh0.zen(DEC, LAT, HRA)[~up]))
+
+    def test_clearSky(self):
+        # Duffie & Beckman, example 2.8.1: tb = 0.62
+        ZEN = np.degrees(np.arccos(0.846))
+        res = kh0.hottel(ZEN, 234, 0.27)
+        self.assertAlmostEqual(res['DNI']/kh0.Gon(234), 0.62, 2)
+        DEC = kh0.dec(npr.randint(1, 366, NR_TST))
+        LAT = npr.random(NR_TST)*180 - 90
+        HRA = kh0.hra(npr.random(NR_TST)*24)
+        ZEN = kh0.zen(DEC, LAT, HRA)
+        dn = npr.randint(1, 366, NR_TST)
+        night = ZEN >= 90
+        for res in (kh0.hottel(ZEN, dn), kh0.ashrae(ZEN, dn)):
+            self.assertTrue(np.all(res['GHI'][night] == 0))
+            self.assertTrue(np.all(res['DHI'][~night] >= 0))
+            self.assertTrue(np.all(res['DHI'][ZEN < 89] > 0))  # no underflow
+            GHI = res['DNI']*np.cos(np.radians(ZEN)) + res['DHI']
+            self.assertTrue(np.allclose(np.where(night, 0, GHI), res['GHI']))
+            flat = kh0.poa(res['DNI'], res['DHI'], res['GHI'], ZEN, 0)
+            self.assertTrue(np.allclose(flat['POA'], res['GHI']))
+            self.assertTrue(np.all(flat['ground'] == 0))
+        self.assertTrue(np.all(kh0.haurwitz(ZEN)[night] == 0))
+        self.assertAlmostEqual(kh0.haurwitz(0), 1098*np.exp(-0.057))
+        TIL, ORI = getRandLATTILORI(NR_TST)[1:]
+        INC = kh0.inc(DEC, LAT, TIL, ORI, HRA)
+        res = kh0.hottel(ZEN, dn)
+        tilted = kh0.poa(res['DNI'], res['DHI'], res['GHI'], INC, TIL, 0.3)
+        self.assertTrue(np.all(tilted['POA'][night] == 0))
+        self.assertTrue(np.all(tilted['beam'] <= res['DNI'] + ERR_MARGIN))
+
+
+def getINCArgs():
+    """Random tuple of scalar args. for inc: DEC, LAT, TIL, ORI"""
+
+    LAT, TIL, ORI = getRandLATTILORI(1)
+    return kh0.dec(npr.randint(1, 366)), LAT[0], TIL[0], ORI[0]
+
+
+def getAzimuth(DEC, LAT, HRA):
+    """Solar azimuth with the quadrants of Point3D.azimuth"""
+
+    DEC, LAT, HRA = np.radians([DEC, LAT, HRA])
+    x = np.cos(DEC)*np.sin(HRA)
+    y = np.sin(LAT)*np.cos(DEC)*np.cos(HRA) - np.cos(LAT)*np.sin(DEC)
+    if y >= 0:
+        dFi = np.pi
+    elif y < 0 and x > 0:
+        dFi = 2*np.pi
+    else:
+        dFi = 0
+    return np.rad2deg(np.arctan(x/y) + dFi)
+
+
+def getRandLATTILORI(n):
+    """Random arrays of LAT, TIL and ORI"""
+
+    LAT = npr.random(n)*180 - 90
+    TIL = npr.random(n)*90
+    ORI = npr.random(n)*360 - 180
+
+    return LAT, TIL, ORI
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)